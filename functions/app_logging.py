@@ -55,6 +55,17 @@ def log_exception(env_name, url, error, curl_command=None):
     _write_block(lines)
 
 
+def log_store_failure(env_name, path, error):
+    lines = [
+        f"[{_timestamp()}] Token store write failure",
+        f"Environment: {env_name}",
+        f"Path: {path}",
+        f"Error: {error}",
+        "-" * 60,
+    ]
+    _write_block(lines)
+
+
 def ensure_log_file():
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     if not LOG_PATH.exists():
@@ -0,0 +1,121 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).resolve().parent.parent / "logs" / "profiles"
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
+ENV_VAR = "SWITCHBLADE_PROFILE"
+MAX_PROFILE_RUNS = 20
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 15
+
+_enabled = False
+_profile_lock = threading.Lock()
+
+
+def init_profiling():
+    env_value = os.environ.get(ENV_VAR, "").strip().lower()
+    if env_value:
+        set_profiling_enabled(env_value not in ("0", "false", "no", "off"))
+        return
+
+    try:
+        data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = {}
+    set_profiling_enabled(bool(data.get("profiling", False)))
+
+
+def is_profiling_enabled():
+    return _enabled
+
+
+def set_profiling_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def run_profiled(label, func, *args):
+    if not _enabled:
+        return func(*args)
+
+    # cProfile and tracemalloc are process-wide, so only one action is profiled at a time.
+    if not _profile_lock.acquire(blocking=False):
+        return func(*args)
+    try:
+        return _profile_call(label, func, args)
+    finally:
+        _profile_lock.release()
+
+
+def _profile_call(label, func, args):
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        if started_tracing:
+            tracemalloc.stop()
+        return func(*args)
+
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            _write_profile(label, profiler, snapshot, peak)
+        except OSError:
+            pass
+
+
+def _write_profile(label, profiler, snapshot, peak):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    safe_label = re.sub(r"[^A-Za-z0-9_-]+", "_", label)
+    base_path = PROFILE_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{safe_label}"
+    profiler.dump_stats(str(base_path.with_suffix(".prof")))
+
+    stats_buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stats_buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    )
+    lines = [
+        f"Action: {label}",
+        f"Total time: {stats.total_tt:.4f}s",
+        f"Peak traced memory: {peak / 1024:.1f} KiB",
+        "",
+        f"Top {TOP_ALLOCATIONS} allocations:",
+    ]
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        lines.append(str(stat))
+    lines.append("")
+    lines.append(stats_buffer.getvalue())
+    base_path.with_suffix(".txt").write_text("\n".join(lines), encoding="utf-8")
+
+    _rotate_profiles()
+
+
+def _rotate_profiles():
+    runs = sorted(PROFILE_DIR.glob("*.prof"))
+    for prof_path in runs[:-MAX_PROFILE_RUNS]:
+        for path in (prof_path, prof_path.with_suffix(".txt")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
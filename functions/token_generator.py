@@ -1,12 +1,44 @@
 import json
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
 from pathlib import Path
 
 import certifi
 import requests
 
-from functions.app_logging import log_exception, log_http_failure
+from functions.app_logging import log_exception, log_http_failure, log_store_failure
+from functions.token_store import parse_expires_in, publish_token, token_file_path
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
+CREDENTIAL_FIELDS = ("url", "client_id", "client_secret", "scope", "audience")
+REQUIRED_FIELDS = ("url", "client_id", "client_secret")
+TOKEN_REFRESH_MARGIN = 60
+
+_session = None
+_session_lock = threading.Lock()
+
+_token_cache = {}
+_key_locks = {}
+_cache_lock = threading.Lock()
+
+
+def _get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Only the connection pool is shared; cookies from one environment must not leak into another.
+            _session = requests.Session()
+            _session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return _session
+
+
+def release_idle_connections():
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
 
 
 def _load_config():
@@ -19,16 +51,85 @@ def _load_config():
         raise ValueError("Config file is invalid JSON.") from exc
 
 
-def generate_token(env_name):
+def _env_profiles(env):
+    # Profiles are edited by hand in config.json; ignore entries that are not objects.
+    profiles = env.get("profiles")
+    if not isinstance(profiles, dict):
+        return {}
+    return {name: profile for name, profile in profiles.items() if isinstance(profile, dict)}
+
+
+def list_profiles(config, env_name):
+    return list(_env_profiles(config.get(env_name) or {}))
+
+
+def resolve_credentials(config, env_name, profile=None):
+    env = config.get(env_name) or {}
+    settings = {field: (env.get(field) or "").strip() for field in CREDENTIAL_FIELDS}
+    if profile:
+        profiles = _env_profiles(env)
+        if profile not in profiles:
+            raise ValueError(f"Unknown profile {profile} for {env_name}.")
+        for field in CREDENTIAL_FIELDS:
+            value = (profiles[profile].get(field) or "").strip()
+            if value:
+                settings[field] = value
+    return settings
+
+
+def is_ready(settings):
+    return all(settings.get(field) for field in REQUIRED_FIELDS)
+
+
+def _key_lock(key):
+    with _cache_lock:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def clear_token_cache():
+    with _cache_lock:
+        _token_cache.clear()
+
+
+def generate_token(env_name, profile=None):
     config = _load_config()
-    cert_path = (config.get("cert_path") or "").strip()
-    env = config.get(env_name, {})
-    url = (env.get("url") or "").strip()
-    client_id = (env.get("client_id") or "").strip()
-    client_secret = (env.get("client_secret") or "").strip()
+    settings = resolve_credentials(config, env_name, profile)
+    label = f"{env_name}/{profile}" if profile else env_name
+
+    if not is_ready(settings):
+        raise ValueError(f"Missing settings for {label}.")
 
-    if not url or not client_id or not client_secret:
-        raise ValueError(f"Missing settings for {env_name}.")
+    # Same (environment, profile, scope) is served from memory until close to expiry,
+    # and concurrent callers wait for a single request instead of each authenticating.
+    # Entries remember the settings they were issued for, so hand edits to config.json are a miss.
+    key = (env_name, profile or "", settings["scope"])
+    with _key_lock(key):
+        cached = _token_cache.get(key)
+        if (
+            cached is not None
+            and cached[2] == settings
+            and cached[1] - TOKEN_REFRESH_MARGIN > time.monotonic()
+        ):
+            return cached[0]
+
+        token, expires_in = _request_token(config, label, settings)
+        with _cache_lock:
+            _token_cache[key] = (token, time.monotonic() + parse_expires_in(expires_in), settings)
+
+    if config.get("share_tokens"):
+        _share_token(env_name, profile, token, expires_in)
+
+    return token
+
+
+def _request_token(config, label, settings):
+    cert_path = (config.get("cert_path") or "").strip()
+    url = settings["url"]
+    client_id = settings["client_id"]
+    client_secret = settings["client_secret"]
 
     headers = {
         "Content-Type": "application/x-www-form-urlencoded",
@@ -47,20 +148,24 @@ def generate_token(env_name):
         f"--data-urlencode 'client_secret={client_secret}'",
         "--data-urlencode 'grant_type=client_credentials'",
     ]
+    for field in ("scope", "audience"):
+        if settings[field]:
+            data[field] = settings[field]
+            curl_parts.append(f"--data-urlencode '{field}={settings[field]}'")
     if cert_path:
         curl_parts.append(f"--cacert '{cert_path}'")
     curl_command = " ".join(curl_parts)
 
     try:
         verify_path = cert_path if cert_path else certifi.where()
-        response = requests.post(url, headers=headers, data=data, timeout=15, verify=verify_path)
+        response = _get_session().post(url, headers=headers, data=data, timeout=15, verify=verify_path)
     except requests.RequestException as exc:
-        log_exception(env_name, url, str(exc), curl_command=curl_command)
+        log_exception(label, url, str(exc), curl_command=curl_command)
         raise RuntimeError(f"Request failed: {exc}") from exc
 
     if response.status_code >= 400:
         log_http_failure(
-            env_name,
+            label,
             url,
             response.status_code,
             response.text,
@@ -72,11 +177,18 @@ def generate_token(env_name):
     try:
         payload = response.json()
     except ValueError as exc:
-        log_exception(env_name, url, f"Invalid JSON response: {exc}", curl_command=curl_command)
+        log_exception(label, url, f"Invalid JSON response: {exc}", curl_command=curl_command)
         raise RuntimeError("Invalid JSON response.") from exc
     token = payload.get("access_token")
     if not token:
-        log_exception(env_name, url, "No access_token in response.", curl_command=curl_command)
+        log_exception(label, url, "No access_token in response.", curl_command=curl_command)
         raise RuntimeError("No access_token in response.")
 
-    return token
+    return token, payload.get("expires_in")
+
+
+def _share_token(env_name, profile, token, expires_in):
+    try:
+        publish_token(env_name, token, expires_in, profile=profile)
+    except (OSError, ValueError) as exc:
+        log_store_failure(env_name, token_file_path(env_name, profile), exc)
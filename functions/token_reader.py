@@ -0,0 +1,47 @@
+import json
+import sys
+import time
+
+from functions.token_store import DEFAULT_TOKEN_TTL, token_file_path
+
+
+def read_token_record(env_name, profile=None):
+    try:
+        return json.loads(token_file_path(env_name, profile).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def read_token(env_name, profile=None, min_validity=30):
+    record = read_token_record(env_name, profile)
+    if not record:
+        return None
+
+    expires_at = record.get("expires_at")
+    if expires_at is None:
+        expires_at = (record.get("issued_at") or 0) + DEFAULT_TOKEN_TTL
+    if expires_at - min_validity <= time.time():
+        return None
+    return record.get("access_token")
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) not in (1, 2):
+        print("Usage: python -m functions.token_reader <PRD|SDB|STG> [profile]", file=sys.stderr)
+        return 2
+
+    env_name = args[0].upper()
+    profile = args[1] if len(args) == 2 else None
+    token = read_token(env_name, profile)
+    if token is None:
+        label = f"{env_name}/{profile}" if profile else env_name
+        print(f"No valid shared token for {label}.", file=sys.stderr)
+        return 1
+
+    print(token)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
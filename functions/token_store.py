@@ -0,0 +1,81 @@
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+STORE_DIR_NAME = "SwitchBladeCard"
+DEFAULT_TOKEN_TTL = 300
+
+
+def parse_expires_in(value):
+    # IdPs may omit expires_in or send it as a string/float; fall back to a conservative lifetime.
+    try:
+        seconds = int(float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_TOKEN_TTL
+    return seconds if seconds > 0 else DEFAULT_TOKEN_TTL
+
+
+def store_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return Path(base) / STORE_DIR_NAME / "tokens"
+    return Path.home() / ".cache" / STORE_DIR_NAME / "tokens"
+
+
+def _safe_name(value):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", value)
+
+
+def token_file_path(env_name, profile=None):
+    name = f"{_safe_name(env_name)}.{_safe_name(profile)}" if profile else _safe_name(env_name)
+    return store_dir() / f"{name}.json"
+
+
+def _ensure_store_dir():
+    path = store_dir()
+    path.mkdir(parents=True, exist_ok=True)
+    if os.name != "nt":
+        os.chmod(path, 0o700)
+    return path
+
+
+def publish_token(env_name, token, expires_in=None, profile=None):
+    directory = _ensure_store_dir()
+    issued_at = int(time.time())
+    record = {
+        "env": env_name,
+        "profile": profile,
+        "access_token": token,
+        "issued_at": issued_at,
+        "expires_at": issued_at + parse_expires_in(expires_in),
+    }
+
+    # Write to a sibling temp file and swap it in, so readers never see a partial record.
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{_safe_name(env_name)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(record, handle)
+        if os.name != "nt":
+            os.chmod(tmp_name, 0o600)
+        os.replace(tmp_name, token_file_path(env_name, profile))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return record
+
+
+def clear_tokens():
+    directory = store_dir()
+    if not directory.exists():
+        return
+    for path in directory.glob("*.json"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
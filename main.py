@@ -1,8 +1,10 @@
+from functions.profiling import init_profiling
 from visuals.config_window import TkController
 from visuals.tray_menu import TrayApp
 
 
 def main():
+    init_profiling()
     tk_controller = TkController()
     app = TrayApp(tk_controller)
     app.run()
@@ -0,0 +1,140 @@
+"""Measure what idle mode releases, driving the app's own non-Win32 code paths.
+
+Run from the repository root on any OS:
+
+    python tools/idle_memory_harness.py
+
+The configuration window is built by the real TkController when a display is
+available; the token request goes through generate_token against a local
+keep-alive HTTP server, so the pooled connection is real.
+"""
+import json
+import sys
+import tempfile
+import threading
+import tkinter as tk
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from functions import token_generator  # noqa: E402
+from functions.memory import rss_bytes, trim_process_memory  # noqa: E402
+from visuals.config_window import TkController  # noqa: E402
+
+
+class _TokenHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"access_token": "harness-token", "expires_in": 3600}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+def _snapshot(label, rows):
+    current, peak = tracemalloc.get_traced_memory()
+    rows.append((label, rss_bytes(), current, peak))
+
+
+def _display_available():
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"Skipping Tk step: {exc}")
+        return False
+    root.destroy()
+    return True
+
+
+def _run_on_tk(controller, func):
+    done = threading.Event()
+
+    def _run():
+        try:
+            func()
+        finally:
+            done.set()
+
+    controller._call(_run)
+    done.wait(10)
+
+
+def _pooled_connections():
+    session = token_generator._session
+    if session is None:
+        return 0
+    return sum(len(adapter.poolmanager.pools) for adapter in session.adapters.values())
+
+
+def _use_local_token_server(server, config_dir):
+    config_path = Path(config_dir) / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "PRD": {
+                    "url": f"http://127.0.0.1:{server.server_port}/connect/token",
+                    "client_id": "harness",
+                    "client_secret": "harness",
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    token_generator.CONFIG_PATH = config_path
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TokenHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config_dir = tempfile.TemporaryDirectory()
+    _use_local_token_server(server, config_dir.name)
+
+    controller = TkController() if _display_available() else None
+
+    rows = []
+    tracemalloc.start()
+    _snapshot("baseline", rows)
+
+    if controller is not None:
+        controller.show_config()
+        _run_on_tk(controller, controller.root.update_idletasks)
+    token_generator.generate_token("PRD")
+    print(f"pooled connections after token request: {_pooled_connections()}")
+    _snapshot("active", rows)
+
+    if controller is not None:
+        _run_on_tk(controller, controller._enter_idle)
+    else:
+        token_generator.release_idle_connections()
+        trim_process_memory()
+    print(f"pooled connections after idle: {_pooled_connections()}")
+    _snapshot("idle", rows)
+
+    tracemalloc.stop()
+    if controller is not None:
+        controller.shutdown()
+    server.shutdown()
+    config_dir.cleanup()
+
+    print(f"{'state':<10}{'rss_kb':>12}{'traced_kb':>12}{'peak_kb':>12}")
+    for label, rss, current, peak in rows:
+        print(f"{label:<10}{rss // 1024:>12}{current // 1024:>12}{peak // 1024:>12}")
+
+    active_rss, idle_rss = rows[1][1], rows[2][1]
+    active_traced, idle_traced = rows[1][2], rows[2][2]
+    print(f"released: rss {(active_rss - idle_rss) // 1024} KB, traced {(active_traced - idle_traced) // 1024} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,25 @@
 import json
 import sys
 import threading
+import time
 import tkinter as tk
-import winreg
 from pathlib import Path
 from tkinter import filedialog, ttk
 
 from PIL import Image, ImageTk
 
 from functions.generate_uuid import generate_uuid_to_clipboard
-from functions.token_generator import generate_token
+from functions.memory import trim_process_memory
+from functions.profiling import run_profiled
+from functions.token_generator import clear_token_cache, generate_token, release_idle_connections
+from functions.token_store import clear_tokens
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
 ASSETS_DIR = Path(__file__).resolve().parent / "icons"
 APP_NAME = "SwitchBlade Card"
 STARTUP_VALUE_NAME = "SwitchBladeCard"
+DEFAULT_IDLE_TIMEOUT_MINUTES = 30
+IDLE_CHECK_INTERVAL_MS = 60_000
 ENVIRONMENTS = ("PRD", "SDB", "STG")
 FIELDS = (
     ("url", "URL"),
@@ -30,8 +35,11 @@ class TkController:
         self.entries = {}
         self.cert_path_entry = None
         self.startup_var = None
+        self.share_tokens_var = None
         self._notifier = None
         self._header_icon = None
+        self._last_activity = time.monotonic()
+        self._idle = False
         self._ready = threading.Event()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
@@ -42,6 +50,7 @@ class TkController:
         self.root.title("SwitchBlade Card")
         self.root.geometry("520x720")
         self.root.withdraw()
+        self.root.after(IDLE_CHECK_INTERVAL_MS, self._check_idle)
         self._ready.set()
         self.root.mainloop()
 
@@ -49,7 +58,48 @@ class TkController:
         if self.root is not None:
             self.root.after(0, func)
 
+    def touch(self):
+        self._last_activity = time.monotonic()
+        self._idle = False
+
+    def _idle_timeout_seconds(self):
+        try:
+            data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+            minutes = float(data.get("idle_timeout_minutes", DEFAULT_IDLE_TIMEOUT_MINUTES))
+        except (OSError, ValueError, TypeError, AttributeError):
+            minutes = DEFAULT_IDLE_TIMEOUT_MINUTES
+        return max(minutes, 0) * 60
+
+    def _config_window_visible(self):
+        if self.config_window is None or not self.config_window.winfo_exists():
+            return False
+        return self.config_window.state() != "withdrawn"
+
+    def _check_idle(self):
+        self.root.after(IDLE_CHECK_INTERVAL_MS, self._check_idle)
+        if self._idle or self._config_window_visible():
+            return
+
+        timeout = self._idle_timeout_seconds()
+        if timeout and time.monotonic() - self._last_activity >= timeout:
+            self._enter_idle()
+
+    def _enter_idle(self):
+        if self.config_window is not None and self.config_window.winfo_exists():
+            self.config_window.destroy()
+        self.config_window = None
+        self.entries = {}
+        self.cert_path_entry = None
+        self.startup_var = None
+        self.share_tokens_var = None
+        self._header_icon = None
+        release_idle_connections()
+        trim_process_memory()
+        self._idle = True
+
     def show_config(self):
+        self.touch()
+
         def _show():
             if self.config_window is None or not self.config_window.winfo_exists():
                 win = tk.Toplevel(self.root)
@@ -131,6 +181,15 @@ class TkController:
                     variable=self.startup_var,
                 ).pack(anchor=tk.W)
 
+                sharing_frame = ttk.LabelFrame(scrollable, text="Token Sharing", padding=10)
+                sharing_frame.pack(fill=tk.X, expand=False, pady=(0, 10))
+                self.share_tokens_var = tk.BooleanVar(value=False)
+                ttk.Checkbutton(
+                    sharing_frame,
+                    text="Share tokens with local tools",
+                    variable=self.share_tokens_var,
+                ).pack(anchor=tk.W)
+
                 form_container = ttk.Frame(scrollable)
                 form_container.pack(fill=tk.BOTH, expand=True)
 
@@ -162,7 +221,7 @@ class TkController:
             self.config_window.lift()
             self.config_window.focus_force()
 
-        self._call(_show)
+        self._call(lambda: run_profiled("show_config", _show))
 
     def _browse_cert(self):
         if self.root is None:
@@ -199,16 +258,21 @@ class TkController:
             self._notifier(title, message, level)
 
     def generate_uuid(self):
+        self.touch()
+
         def _generate():
             generate_uuid_to_clipboard(self.root)
             self._notify("UUID", "UUID copied to clipboard.")
 
-        self._call(_generate)
+        self._call(lambda: run_profiled("generate_uuid", _generate))
+
+    def generate_token(self, env_name, profile=None):
+        self.touch()
+        label = f"{env_name}/{profile}" if profile else env_name
 
-    def generate_token(self, env_name):
         def _generate():
             try:
-                token = generate_token(env_name)
+                token = generate_token(env_name, profile)
             except Exception as exc:
                 self._notify("Token Error", str(exc), level="error")
                 return
@@ -216,9 +280,9 @@ class TkController:
             self.root.clipboard_clear()
             self.root.clipboard_append(token)
             self.root.update_idletasks()
-            self._notify("Token Copied", f"Token for {env_name} copied to clipboard.")
+            self._notify("Token Copied", f"Token for {label} copied to clipboard.")
 
-        self._call(_generate)
+        self._call(lambda: run_profiled(f"generate_token_{label}", _generate))
 
     def _load_config(self):
         if not CONFIG_PATH.exists():
@@ -235,6 +299,8 @@ class TkController:
             self.cert_path_entry.insert(0, cert_path)
         if self.startup_var is not None:
             self.startup_var.set(bool(data.get("auto_start", False)))
+        if self.share_tokens_var is not None:
+            self.share_tokens_var.set(bool(data.get("share_tokens", False)))
 
         for env in ENVIRONMENTS:
             env_data = data.get(env, {})
@@ -247,17 +313,28 @@ class TkController:
 
     def _save_config(self):
         data = {}
+        if CONFIG_PATH.exists():
+            try:
+                data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = {}
+        was_sharing = bool(data.get("share_tokens", False))
         if self.cert_path_entry is not None:
             data["cert_path"] = self.cert_path_entry.get().strip()
         if self.startup_var is not None:
             data["auto_start"] = bool(self.startup_var.get())
+        if self.share_tokens_var is not None:
+            data["share_tokens"] = bool(self.share_tokens_var.get())
         for env in ENVIRONMENTS:
-            data[env] = {}
+            data[env] = dict(data.get(env) or {})
             for field_key, _label in FIELDS:
                 entry = self.entries.get(env, {}).get(field_key)
                 data[env][field_key] = entry.get().strip() if entry is not None else ""
 
         CONFIG_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        clear_token_cache()
+        if was_sharing and not data.get("share_tokens", False):
+            clear_tokens()
         self._apply_startup_setting(bool(data.get("auto_start", False)))
 
     def _save_and_close(self):
@@ -266,6 +343,8 @@ class TkController:
             self.config_window.withdraw()
 
     def _apply_startup_setting(self, enabled):
+        import winreg
+
         try:
             key = winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
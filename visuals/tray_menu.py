@@ -7,6 +7,8 @@ import win32con
 import win32gui
 
 from functions.app_logging import open_log_file
+from functions.profiling import is_profiling_enabled, run_profiled, set_profiling_enabled
+from functions.token_generator import is_ready, list_profiles, resolve_credentials
 
 ASSETS_DIR = Path(__file__).resolve().parent / "icons"
 CACHE_DIR = ASSETS_DIR / "_cache"
@@ -79,8 +81,16 @@ class TrayApp:
     ID_CONFIG = 1005
     ID_LOGS = 1006
     ID_EXIT = 1007
+    ID_PROFILING = 1008
+    ID_PROFILE_BASE = 2000
 
-    _required_fields = ("url", "client_id", "client_secret")
+    # These only schedule work on the Tk thread, which profiles the work itself.
+    _deferred_commands = (ID_TOKEN_PRD, ID_TOKEN_SDB, ID_TOKEN_STG, ID_UUID, ID_CONFIG)
+    _command_labels = {
+        ID_LOGS: "open_logs",
+        ID_PROFILING: "toggle_profiling",
+        ID_EXIT: "quit",
+    }
 
     def __init__(self, tk_controller):
         self.tk_controller = tk_controller
@@ -88,6 +98,7 @@ class TrayApp:
         self._hicon = None
         self._bitmaps = []
         self._actions = {}
+        self._next_profile_id = self.ID_PROFILE_BASE
         self._register_window()
         self._create_tray_icon()
         self.tk_controller.set_notifier(self.show_notification)
@@ -134,28 +145,32 @@ class TrayApp:
             self.ID_UUID: self.tk_controller.generate_uuid,
             self.ID_CONFIG: self.tk_controller.show_config,
             self.ID_LOGS: self._open_logs,
+            self.ID_PROFILING: self._toggle_profiling,
             self.ID_EXIT: self.quit,
         }
 
+        config = self._load_config()
+        self._next_profile_id = self.ID_PROFILE_BASE
         menu = win32gui.CreatePopupMenu()
 
-        win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_TOKEN_PRD, "Gerar Token PRD")
-        win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_TOKEN_SDB, "Gerar Token SDB")
-        win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_TOKEN_STG, "Gerar Token STG")
+        self._append_token_item(menu, config, self.ID_TOKEN_PRD, "PRD", "circle_green.png")
+        self._append_token_item(menu, config, self.ID_TOKEN_SDB, "SDB", "circle_yellow.png")
+        self._append_token_item(menu, config, self.ID_TOKEN_STG, "STG", "circle_red.png")
         win32gui.AppendMenu(menu, win32con.MF_SEPARATOR, 0, "")
         win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_UUID, "Gerar UUID")
         win32gui.AppendMenu(menu, win32con.MF_SEPARATOR, 0, "")
         win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_CONFIG, "Configuracoes")
         win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_LOGS, "Ver Logs")
+        profiling_flags = win32con.MF_STRING
+        if is_profiling_enabled():
+            profiling_flags |= win32con.MF_CHECKED
+        win32gui.AppendMenu(menu, profiling_flags, self.ID_PROFILING, "Profiling")
         win32gui.AppendMenu(menu, win32con.MF_STRING, self.ID_EXIT, "Sair")
 
-        self._apply_env_enabled(menu, self.ID_TOKEN_PRD, "PRD")
-        self._apply_env_enabled(menu, self.ID_TOKEN_SDB, "SDB")
-        self._apply_env_enabled(menu, self.ID_TOKEN_STG, "STG")
+        self._apply_env_enabled(menu, config, self.ID_TOKEN_PRD, "PRD")
+        self._apply_env_enabled(menu, config, self.ID_TOKEN_SDB, "SDB")
+        self._apply_env_enabled(menu, config, self.ID_TOKEN_STG, "STG")
 
-        self._set_menu_icon(menu, self.ID_TOKEN_PRD, "circle_green.png")
-        self._set_menu_icon(menu, self.ID_TOKEN_SDB, "circle_yellow.png")
-        self._set_menu_icon(menu, self.ID_TOKEN_STG, "circle_red.png")
         self._set_menu_icon(menu, self.ID_UUID, "numbers_1234.png")
         self._set_menu_icon(menu, self.ID_CONFIG, "wrench.png")
         self._set_menu_icon(menu, self.ID_LOGS, "documents.png")
@@ -163,20 +178,34 @@ class TrayApp:
 
         return menu
 
-    def _apply_env_enabled(self, menu, item_id, env_name):
-        if self._is_env_ready(env_name):
+    def _append_token_item(self, menu, config, item_id, env_name, icon_name):
+        profiles = list_profiles(config, env_name)
+        if not profiles:
+            win32gui.AppendMenu(menu, win32con.MF_STRING, item_id, f"Gerar Token {env_name}")
+            self._set_menu_icon(menu, item_id, icon_name)
+            return
+
+        # With named profiles the environment becomes a submenu; the default credentials keep item_id.
+        submenu = win32gui.CreatePopupMenu()
+        win32gui.AppendMenu(submenu, win32con.MF_STRING, item_id, "Padrao")
+        for profile in profiles:
+            profile_id = self._next_profile_id
+            self._next_profile_id += 1
+            self._actions[profile_id] = lambda p=profile: self.tk_controller.generate_token(env_name, p)
+            win32gui.AppendMenu(submenu, win32con.MF_STRING, profile_id, profile)
+            self._apply_env_enabled(submenu, config, profile_id, env_name, profile)
+        win32gui.AppendMenu(menu, win32con.MF_POPUP, submenu, f"Gerar Token {env_name}")
+        position = win32gui.GetMenuItemCount(menu) - 1
+        self._set_menu_icon(menu, position, icon_name, win32con.MF_BYPOSITION)
+
+    def _apply_env_enabled(self, menu, config, item_id, env_name, profile=None):
+        if self._is_env_ready(config, env_name, profile):
             win32gui.EnableMenuItem(menu, item_id, win32con.MF_BYCOMMAND | win32con.MF_ENABLED)
         else:
             win32gui.EnableMenuItem(menu, item_id, win32con.MF_BYCOMMAND | win32con.MF_GRAYED)
 
-    def _is_env_ready(self, env_name):
-        data = self._load_config()
-        env = data.get(env_name, {})
-        for field in self._required_fields:
-            value = (env.get(field) or "").strip()
-            if not value:
-                return False
-        return True
+    def _is_env_ready(self, config, env_name, profile=None):
+        return is_ready(resolve_credentials(config, env_name, profile))
 
     def _load_config(self):
         if not CONFIG_PATH.exists():
@@ -187,10 +216,10 @@ class TrayApp:
         except json.JSONDecodeError:
             return {}
 
-    def _set_menu_icon(self, menu, item_id, file_name):
+    def _set_menu_icon(self, menu, item_id, file_name, flags=win32con.MF_BYCOMMAND):
         hbm = load_menu_bitmap(file_name)
         if hbm is not None:
-            win32gui.SetMenuItemBitmaps(menu, item_id, win32con.MF_BYCOMMAND, hbm, hbm)
+            win32gui.SetMenuItemBitmaps(menu, item_id, flags, hbm, hbm)
             self._bitmaps.append(hbm)
 
     def _open_logs(self):
@@ -199,8 +228,15 @@ class TrayApp:
         except Exception as exc:
             self.show_notification("Logs", str(exc), level="error")
 
+    def _toggle_profiling(self):
+        enabled = not is_profiling_enabled()
+        set_profiling_enabled(enabled)
+        state = "enabled" if enabled else "disabled"
+        self.show_notification("Profiling", f"Profiling {state}. Output: logs/profiles")
+
     def _show_menu(self):
-        menu = self._create_menu()
+        self.tk_controller.touch()
+        menu = run_profiled("show_menu", self._create_menu)
         pos = win32gui.GetCursorPos()
         win32gui.SetForegroundWindow(self.hwnd)
         win32gui.TrackPopupMenu(
@@ -213,12 +249,23 @@ class TrayApp:
             None,
         )
         win32gui.PostMessage(self.hwnd, win32con.WM_NULL, 0, 0)
+        win32gui.DestroyMenu(menu)
+        self._release_bitmaps()
+
+    def _release_bitmaps(self):
+        for hbm in self._bitmaps:
+            win32gui.DeleteObject(hbm)
+        self._bitmaps = []
 
     def _on_command(self, wparam):
         cmd_id = win32api.LOWORD(wparam)
         action = self._actions.get(cmd_id)
-        if action:
+        if not action:
+            return 0
+        if cmd_id in self._deferred_commands or cmd_id >= self.ID_PROFILE_BASE:
             action()
+        else:
+            run_profiled(self._command_labels.get(cmd_id, f"command_{cmd_id}"), action)
         return 0
 
     def _on_tray_notify(self, lparam):
@@ -267,8 +314,7 @@ class TrayApp:
         win32gui.Shell_NotifyIcon(win32gui.NIM_DELETE, (self.hwnd, 0))
         if self._hicon:
             win32gui.DestroyIcon(self._hicon)
-        for hbm in self._bitmaps:
-            win32gui.DeleteObject(hbm)
+        self._release_bitmaps()
         self.tk_controller.shutdown()
         win32gui.PostQuitMessage(0)
 